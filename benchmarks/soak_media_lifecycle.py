@@ -0,0 +1,149 @@
+"""Soak benchmark: drive PlaybackEngine through many media transitions against a fake VLC backend
+and check that live media objects and Python heap usage stay flat.
+
+Run from the repository root:
+    python benchmarks/soak_media_lifecycle.py [--transitions 100000] [--urls 500]
+
+The fake backend follows libvlc reference counting, so a media counts as live until every
+reference taken by media_new(), set_media() or get_media() has been released.
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from signengine import player as player_module  # noqa: E402
+from signengine.player import PlaybackEngine  # noqa: E402
+from signengine.config import MEDIA_CACHE_SIZE  # noqa: E402
+
+MEDIA_PAYLOAD_BYTES = 16 * 1024  # Stand-in for the native memory held by a parsed libvlc media
+MAX_GROWTH_BYTES = 256 * 1024  # Allowed heap growth between the warm-up and the end of the run
+
+
+class FakeMedia:
+    """Reference counted like libvlc_media_t: created with one reference, freed when the count reaches 0."""
+    live = 0
+
+    def __init__(self, mrl):
+        self.mrl = mrl
+        self.refcount = 1
+        self.payload = bytearray(MEDIA_PAYLOAD_BYTES)
+        FakeMedia.live += 1
+
+    def get_mrl(self):
+        return self.mrl
+
+    def retain(self):
+        assert self.refcount > 0, "retain() on freed media"
+        self.refcount += 1
+
+    def release(self):
+        assert self.refcount > 0, "release() on freed media"
+        self.refcount -= 1
+        if self.refcount == 0:
+            self.payload = None
+            FakeMedia.live -= 1
+
+
+class FakeMediaPlayer:
+    """Follows libvlc ownership rules: set_media() and get_media() both retain the media."""
+
+    def __init__(self):
+        self.media = None
+        self.playing = False
+
+    def get_media(self):
+        if self.media:
+            self.media.retain()
+        return self.media
+
+    def set_media(self, media):
+        media.retain()
+        if self.media:
+            self.media.release()
+        self.media = media
+
+    def play(self):
+        self.playing = True
+
+    def stop(self):
+        self.playing = False
+
+    def is_playing(self):
+        return self.playing
+
+    def release(self):
+        if self.media:
+            self.media.release()
+        self.media = None
+
+
+class FakeInstance:
+
+    def media_player_new(self):
+        return FakeMediaPlayer()
+
+    def media_new(self, mrl):
+        return FakeMedia(mrl)
+
+    def release(self):
+        pass
+
+
+async def soak(transitions: int, url_count: int, report_every: int) -> bool:
+    FakeMedia.live = 0
+    engine = PlaybackEngine(loop=asyncio.get_running_loop())
+    cache_size = engine.media_cache.max_items
+    urls = [f"http://example.com/video{i}.mp4" for i in range(url_count)]
+
+    warmup = min(transitions // 10, 10_000)
+    baseline = None
+    started = time.perf_counter()
+    for i in range(transitions):
+        await engine.play(urls[i % url_count])
+        if i + 1 == warmup:
+            baseline = tracemalloc.get_traced_memory()[0]
+        if (i + 1) % report_every == 0:
+            current = tracemalloc.get_traced_memory()[0]
+            print(f"{i + 1:>8} transitions  live media: {FakeMedia.live:>3}  heap: {current / 1024:8.1f} KiB")
+
+    elapsed = time.perf_counter() - started
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    live_media = FakeMedia.live
+    engine.close()
+
+    print(f"{transitions} transitions in {elapsed:.1f}s ({transitions / elapsed:.0f}/s)")
+    print(f"Live media: {live_media} (cache size {cache_size}), after close: {FakeMedia.live}")
+    print(f"Heap growth after warm-up: {growth / 1024:.1f} KiB (limit {MAX_GROWTH_BYTES / 1024:.0f} KiB)")
+    return live_media <= cache_size and FakeMedia.live == 0 and growth < MAX_GROWTH_BYTES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transitions", type=int, default=100_000, help="Transitions per scenario")
+    parser.add_argument("--urls", type=int, default=500, help="Distinct URLs cycled through in the eviction scenario")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    player_module.vlc.Instance = FakeInstance
+    tracemalloc.start()
+
+    # Eviction: more URLs than cache slots, every transition creates and releases media.
+    # Reuse: URLs fit in the cache, every transition replays already parsed media.
+    scenarios = [("eviction", args.urls), ("reuse", MEDIA_CACHE_SIZE)]
+    flat = True
+    for name, url_count in scenarios:
+        print(f"\n== {name}: {url_count} distinct URLs ==")
+        passed = asyncio.run(soak(args.transitions, url_count, report_every=max(args.transitions // 10, 1)))
+        print("PASS: memory stayed flat" if passed else "FAIL: memory grew")
+        flat = flat and passed
+    sys.exit(0 if flat else 1)
+
+
+if __name__ == "__main__":
+    main()
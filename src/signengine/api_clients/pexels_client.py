@@ -30,6 +30,7 @@ class PexelsClient:
                     videos.append({
                         "title": video.get("id", "Untitled"),
                         "url": video.get("video_files", [{}])[0].get("link", ""),
+                        "thumbnail": video.get("image", ""),
                     })
 
                 logger.info(f"Successfully fetched {len(videos)} videos.")
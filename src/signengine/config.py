@@ -1,2 +1,42 @@
+import os
+
 API_URL = "http://127.0.0.1:8000/playlist"  # To change later to the actual API URL
 VIDEO_OUTPUT_ID = 4326100592  # Specific to my macbook
+
+# Playback watchdog
+WATCHDOG_POLL_INTERVAL = 1.0  # Seconds between progress checks
+WATCHDOG_STALL_WINDOW = 8.0  # Seconds without progress before an item is considered stalled
+WATCHDOG_MAX_BACKOFF = 300.0  # Longest wait between recovery attempts when nothing can be played
+WATCHDOG_MAX_INCIDENTS = 500  # Most recent incidents kept in memory
+WATCHDOG_MAX_CANDIDATES = 3  # Playlist items checked per recovery before falling back
+WATCHDOG_RECOVERY_BUDGET = 5.0  # Seconds the candidate checks may take in total
+FALLBACK_MEDIA_PATH = None  # Locally cached item to play when nothing else is valid, e.g. "file:///opt/signengine/fallback.mp4"
+
+# Prefetch scheduler
+PREFETCH_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".signengine", "cache")  # Where upcoming media is downloaded
+PREFETCH_CACHE_MAX_BYTES = 2 * 1024 ** 3  # Prefetch cache size, least recently played files are evicted first
+PREFETCH_BANDWIDTH_LIMIT = 2_000_000  # Bytes per second shared by all prefetch downloads
+PREFETCH_MAX_CONCURRENT = 2  # Parallel prefetch downloads
+PREFETCH_LOOKAHEAD = 3  # Number of upcoming playlist items to prefetch
+PREFETCH_PLAYBACK_RESERVE = 0.5  # Share of the bandwidth left to playback while a remote stream is playing
+PREFETCH_POLL_INTERVAL = 5.0  # Seconds between scheduling passes
+DEFAULT_ITEM_DURATION = 30.0  # Seconds assumed for items without a 'duration' key
+
+# Playlist thumbnails
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".signengine", "thumbnails")  # On-disk thumbnail cache
+THUMBNAIL_MEMORY_ITEMS = 200  # Thumbnails kept in memory
+THUMBNAIL_DISK_ITEMS = 2000  # Thumbnails kept on disk
+THUMBNAIL_WORKERS = 2  # Processes used to extract frames
+THUMBNAIL_WIDTH = 160  # Pixels, height follows the aspect ratio
+THUMBNAIL_FRAME_OFFSET = 1.0  # Seconds into the video where the frame is taken
+THUMBNAIL_SCROLL_DELAY_MS = 150  # Milliseconds the playlist must stay still before thumbnails are requested
+
+# Playlist refresh
+PLAYLIST_REFRESH_INTERVAL = 60.0  # Seconds between playlist reloads in the GUI
+
+# VLC media lifecycle
+MEDIA_CACHE_SIZE = 8  # Parsed vlc.Media objects kept for reuse, older ones are released
+
+# Playlist validation
+VALIDATION_MODE = "head"  # "head" checks the status only, "sniff" also reads the first bytes to confirm the container
+SNIFF_BYTES = 4096  # Maximum bytes read per item when sniffing
@@ -1,9 +1,15 @@
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QListWidget, QPushButton, QHBoxLayout, QSlider, QLabel
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSize, QEvent, QTimer
+from PyQt5.QtGui import QIcon, QPixmap
 from qasync import QEventLoop
 import asyncio
 from signengine.api_client import fetch_playlist
 from signengine.player import PlaybackEngine
+from signengine.watchdog import PlaybackWatchdog
+from signengine.prefetch import PrefetchScheduler
+from signengine.thumbnails import ThumbnailPipeline
+from signengine.playlist_state import PlaylistState
+from signengine.config import THUMBNAIL_WIDTH, THUMBNAIL_SCROLL_DELAY_MS, PLAYLIST_REFRESH_INTERVAL
 
 class SignEngineGUI(QMainWindow):
     def __init__(self, loop):
@@ -19,9 +25,14 @@ class SignEngineGUI(QMainWindow):
         # Playlist
         self.playlist_label = QLabel("Playlist:")
         self.playlist = QListWidget()
+        self.playlist.setIconSize(QSize(THUMBNAIL_WIDTH, THUMBNAIL_WIDTH * 9 // 16))
         self.layout.addWidget(self.playlist_label)
         self.layout.addWidget(self.playlist)
 
+        # Rows shown in the playlist widget, kept in sync through minimal diffs
+        self.playlist_state = PlaylistState()
+        self.playlist_data = self.playlist_state.items
+
         # Playback controls
         self.controls_layout = QHBoxLayout()
         self.play_button = QPushButton("Play")
@@ -45,37 +56,145 @@ class SignEngineGUI(QMainWindow):
         self.loop = loop
         self.player = PlaybackEngine(loop=self.loop)
 
+        # Prefetch upcoming items and play the local copies once they are ready
+        self.prefetcher = PrefetchScheduler(self.player)
+        self.player.media_resolver = self.prefetcher.resolve
+        self.prefetcher.start()
+
+        # Watchdog skips stalled or failed items automatically
+        self.watchdog = PlaybackWatchdog(
+            self.player,
+            is_cached=self.prefetcher.is_cached,
+            content_lengths=self.prefetcher.content_lengths,
+        )
+        self.watchdog.start()
+
+        # Thumbnails are loaded lazily for the rows on screen
+        self.thumbnails = ThumbnailPipeline()
+        self.thumbnail_urls = set()
+        # Thumbnails are requested once scrolling or resizing settles, not for every row passed on the way
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(THUMBNAIL_SCROLL_DELAY_MS)
+        self.thumbnail_timer.timeout.connect(self.load_visible_thumbnails)
+
         # Connect signals
         self.play_button.clicked.connect(self.handle_play)
         self.pause_button.clicked.connect(self.handle_pause)
         self.stop_button.clicked.connect(self.handle_stop)
         self.volume_slider.valueChanged.connect(self.handle_volume)
+        self.playlist.verticalScrollBar().valueChanged.connect(lambda _: self.thumbnail_timer.start())
+        self.playlist.itemDoubleClicked.connect(self.play_selected_video)
+        # Resizing the window reveals rows without moving the scrollbar
+        self.playlist.viewport().installEventFilter(self)
+
+        # Load playlist and keep it up to date
+        self.refresh_task = self.loop.create_task(self.refresh_playlist())
+        self.closing = False
 
-        # Load playlist
-        self.loop.create_task(self.load_playlist())
+    async def refresh_playlist(self):
+        """Reload the playlist periodically, only changed rows are touched."""
+        while True:
+            await self.load_playlist()
+            await asyncio.sleep(PLAYLIST_REFRESH_INTERVAL)
 
     async def load_playlist(self):
-        """Fetch playlist from the API and populate the list."""
+        """Fetch playlist from the API and apply the changes to the list without touching playback."""
         try:
             playlist = await fetch_playlist()
             if not playlist:
-                self.playlist.addItem("Failed to fetch playlist or empty playlist.")
+                self.playlist_label.setText("Playlist: failed to fetch playlist or empty playlist.")
                 return
 
-            self.playlist.clear()
-            self.playlist_data = playlist
-            for item in playlist:
-                self.playlist.addItem(item["title"])
-            self.playlist.itemDoubleClicked.connect(self.play_selected_video)
+            changes = self.playlist_state.update(playlist)
+            self.playlist_data = self.playlist_state.items
+            self.watchdog.set_playlist(playlist)
+            self.prefetcher.set_playlist(playlist)
+            self.playlist_label.setText("Playlist:")
+
+            for change in changes:
+                if change.action == "remove":
+                    self.playlist.takeItem(change.row)
+                elif change.action == "insert":
+                    self.playlist.insertItem(change.row, change.item["title"])
+                    # New rows, including moved ones, need their icon set again
+                    self.thumbnail_urls.discard(change.item["url"])
+                else:
+                    self.playlist.item(change.row).setText(change.item["title"])
+
+            self.thumbnail_urls.intersection_update(entry["url"] for entry in self.playlist_data)
+            self.load_visible_thumbnails()
         except Exception as e:
-            self.playlist.addItem(f"Error loading playlist: {str(e)}")
+            self.playlist_label.setText(f"Playlist: error loading playlist: {str(e)}")
+
+    def load_visible_thumbnails(self):
+        """Request thumbnails for the playlist rows currently on screen."""
+        if not self.playlist_data:
+            return
+
+        viewport = self.playlist.viewport().rect()
+        first_row = self.playlist.indexAt(viewport.topLeft()).row()
+        last_row = self.playlist.indexAt(viewport.bottomLeft()).row()
+        if first_row < 0:
+            first_row = 0
+        if last_row < 0:
+            last_row = len(self.playlist_data) - 1
+
+        visible = self.playlist_data[first_row:last_row + 1]
+        # Queued decodes for rows that scrolled away are dropped by the pipeline
+        self.thumbnails.set_visible(visible)
+        for entry in visible:
+            if entry["url"] not in self.thumbnail_urls:
+                self.thumbnail_urls.add(entry["url"])
+                self.loop.create_task(self.load_thumbnail(entry))
+
+    def eventFilter(self, obj, event):
+        """Load thumbnails for rows revealed by a playlist viewport resize."""
+        if obj is self.playlist.viewport() and event.type() == QEvent.Resize:
+            self.thumbnail_timer.start()
+        return super().eventFilter(obj, event)
+
+    async def load_thumbnail(self, entry):
+        """Fetch the thumbnail for a playlist entry and show it on every row playing it."""
+        data = await self.thumbnails.get(entry)
+        if not data:
+            # Allow another attempt the next time the row comes into view
+            self.thumbnail_urls.discard(entry["url"])
+            return
+
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return
+        # Rows may have moved while the thumbnail was generated
+        for row, current in enumerate(self.playlist_data):
+            if current["url"] == entry["url"]:
+                self.playlist.item(row).setIcon(QIcon(pixmap))
 
     def play_selected_video(self, item):
         """Play the video selected from the playlist."""
-        video_title = item.text()
-        video_url = next((entry["url"] for entry in self.playlist_data if entry["title"] == video_title), None)
-        if video_url:
-            self.loop.create_task(self.player.play(video_url))
+        row = self.playlist.row(item)
+        if 0 <= row < len(self.playlist_data):
+            self.loop.create_task(self.player.play(self.playlist_data[row]["url"]))
+
+    def closeEvent(self, event):
+        """Stop background tasks, then release VLC and worker processes before closing."""
+        if not self.closing:
+            self.closing = True
+            event.ignore()
+            self.loop.create_task(self.shutdown())
+            return
+        super().closeEvent(event)
+
+    async def shutdown(self):
+        """Stop everything that may still call into VLC, release it and close the window."""
+        self.thumbnail_timer.stop()
+        self.refresh_task.cancel()
+        await asyncio.gather(self.refresh_task, return_exceptions=True)
+        await self.watchdog.stop()
+        await self.prefetcher.stop()
+        self.thumbnails.shutdown()
+        self.player.close()
+        self.close()
 
     def handle_play(self):
         """Handle play button click."""
@@ -0,0 +1,58 @@
+import vlc
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from signengine.config import MEDIA_CACHE_SIZE
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("MediaCache")
+
+
+# Bounded LRU of vlc.Media objects keyed by MRL. Evicted media are released so memory stays flat on long runs.
+# Releasing only drops our reference: a media still set on the player is kept alive by libvlc until it is replaced.
+class MediaCache:
+
+    def __init__(self, instance: vlc.Instance, max_items: int = MEDIA_CACHE_SIZE):
+        self.instance = instance
+        # At least one slot, otherwise the media would be released before it reaches the player
+        self.max_items = max(max_items, 1)
+        self._media: "OrderedDict[str, vlc.Media]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._media)
+
+    def get(self, mrl: str) -> Optional[vlc.Media]:
+        """Return the cached media for mrl, creating it (and evicting the oldest entry) on a miss."""
+        with self._lock:
+            media = self._media.get(mrl)
+            if media is not None:
+                self._media.move_to_end(mrl)
+                logger.debug(f"Reusing media for {mrl}")
+                return media
+
+            media = self.instance.media_new(mrl)
+            if not media:
+                return None
+
+            self._media[mrl] = media
+            while len(self._media) > self.max_items:
+                evicted_mrl, evicted = self._media.popitem(last=False)
+                logger.debug(f"Releasing media for {evicted_mrl}")
+                evicted.release()
+            return media
+
+    def discard(self, mrl: str) -> None:
+        """Release the media for mrl, e.g. after it failed, so the next play parses it again."""
+        with self._lock:
+            media = self._media.pop(mrl, None)
+            if media is not None:
+                media.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            while self._media:
+                _, media = self._media.popitem(last=False)
+                media.release()
@@ -2,9 +2,11 @@ import vlc
 import logging
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import Optional, Callable
 import re
 
+from signengine.media_cache import MediaCache
+
 # Logging configuration
 logging.basicConfig(
     level=logging.DEBUG,
@@ -20,6 +22,9 @@ class PlaybackEngine:
         logger.info("Initializing Playback Engine")
         self.instance = vlc.Instance()
         self.player = self.instance.media_player_new()
+
+        # Parsed media are reused for repeated URLs and released once evicted
+        self.media_cache = MediaCache(self.instance)
         
         # Use provided loop or the running loop
         if loop:
@@ -30,6 +35,13 @@ class PlaybackEngine:
         # Thread pool for non-async VLC operations
         self.executor = ThreadPoolExecutor(max_workers=4)
 
+        # Path of the media most recently handed to VLC (used by the watchdog)
+        self.current_media_path: Optional[str] = None
+        self.current_mrl: Optional[str] = None
+
+        # Optional hook mapping a playlist URL to the MRL to open, e.g. a prefetched local copy
+        self.media_resolver: Optional[Callable[[str], str]] = None
+
         # Set video output if provided
         if video_output:
             self._set_video_output(video_output)
@@ -52,13 +64,9 @@ class PlaybackEngine:
             return
 
         try:
-            # Check current media path
-            current_media = self.player.get_media()
-            current_media_path = (
-                current_media.get_mrl() if current_media and current_media.get_mrl() else None
-            )
-
-            if current_media_path == media_path:
+            # Compare with the MRL we set last. player.get_media() would retain a reference we never release
+            mrl = self.media_resolver(media_path) if self.media_resolver else media_path
+            if self.current_mrl == mrl:
                 logger.info("Media already loaded. Restarting playback...")
                 await self.loop.run_in_executor(self.executor, self.player.play)
                 return
@@ -70,19 +78,42 @@ class PlaybackEngine:
                 logger.debug("stop() executed during play transition")
 
             # Load and play new media
-            logger.info(f"Loading media: {media_path}")
-            media = await self.loop.run_in_executor(self.executor, self.instance.media_new, media_path)
+            logger.info(f"Loading media: {mrl}")
+            media = await self.loop.run_in_executor(self.executor, self.media_cache.get, mrl)
             if not media:
                 logger.error("Failed to create media object. Check the path or URL.")
                 return
 
             self.player.set_media(media)
+            self.current_media_path = media_path
+            self.current_mrl = mrl
             logger.info("Starting playback...")
             await self.loop.run_in_executor(self.executor, self.player.play)
             logger.info("Playback started successfully.")
         except Exception as e:
             logger.error(f"Error during playback: {e}")
 
+    def discard_media(self, media_path: str):
+        # Drop cached media for a failed item so it is parsed again next time
+        mrls = {media_path}
+        if self.media_resolver:
+            mrls.add(self.media_resolver(media_path))
+        for mrl in mrls:
+            self.media_cache.discard(mrl)
+        # Otherwise the next play() of the same item would restart the failed media instead of loading it again
+        if self.current_mrl in mrls:
+            self.current_mrl = None
+
+    def close(self):
+        # Release every VLC object explicitly, the engine cannot be used afterwards
+        logger.info("Shutting down playback engine")
+        # Wait for in-flight VLC calls and drop queued ones before anything is released
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.player.stop()
+        self.player.release()
+        self.media_cache.clear()
+        self.instance.release()
+
     async def stop(self):
         logger.info("Stopping playback...")
         await self.loop.run_in_executor(self.executor, self.player.stop)
@@ -111,6 +142,13 @@ class PlaybackEngine:
     async def get_position(self) -> float:
         return await self.loop.run_in_executor(self.executor, self.player.get_position)
 
+    async def get_time(self) -> int:
+        # Current playback time in milliseconds (-1 if nothing is loaded)
+        return await self.loop.run_in_executor(self.executor, self.player.get_time)
+
+    async def get_state(self) -> vlc.State:
+        return await self.loop.run_in_executor(self.executor, self.player.get_state)
+
     async def is_playing(self) -> bool:
         is_playing = await self.loop.run_in_executor(self.executor, self.player.is_playing)
         logger.info(f"is_playing() returned: {is_playing}")
@@ -0,0 +1,65 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import List, Dict, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("PlaylistState")
+
+
+# Stable identity of a playlist item: its 'id' when the API provides one, otherwise its URL.
+def item_id(item: Dict[str, str]) -> str:
+    return str(item.get("id") or item.get("url", ""))
+
+
+# A single row change. Changes must be applied in order, each row refers to the list as left by the previous change.
+@dataclass
+class PlaylistChange:
+    action: str  # "insert", "remove" or "update"
+    row: int
+    item: Optional[Dict[str, str]] = None
+
+
+# Keeps the displayed playlist and turns a refreshed playlist into the minimal list of row changes.
+class PlaylistState:
+
+    def __init__(self):
+        self.items: List[Dict[str, str]] = []
+        self._ids: List[str] = []
+
+    @staticmethod
+    def _keys(playlist: List[Dict[str, str]]) -> List[str]:
+        # The same item may be scheduled more than once, number repeats so every row keeps its own key
+        seen = Counter()
+        keys = []
+        for item in playlist:
+            key = item_id(item)
+            keys.append(f"{key}#{seen[key]}" if seen[key] else key)
+            seen[key] += 1
+        return keys
+
+    def update(self, playlist: List[Dict[str, str]]) -> List[PlaylistChange]:
+        """Replace the playlist and return the row changes turning the old one into the new one."""
+        new_ids = self._keys(playlist)
+        changes = []
+
+        matcher = SequenceMatcher(None, self._ids, new_ids, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            # Rows before j1 already match the new playlist, so old row i1 now sits at j1
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    if self.items[i1 + offset] != playlist[j1 + offset]:
+                        changes.append(PlaylistChange("update", j1 + offset, playlist[j1 + offset]))
+                continue
+
+            if tag in ("delete", "replace"):
+                changes.extend(PlaylistChange("remove", j1) for _ in range(i2 - i1))
+            if tag in ("insert", "replace"):
+                changes.extend(PlaylistChange("insert", row, playlist[row]) for row in range(j1, j2))
+
+        self.items = list(playlist)
+        self._ids = new_ids
+        logger.info(f"Playlist updated: {len(changes)} row changes for {len(playlist)} items.")
+        return changes
+
@@ -0,0 +1,283 @@
+import os
+import time
+import httpx
+import asyncio
+import hashlib
+import logging
+import pathlib
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Set, Tuple, Callable
+
+from signengine.config import (
+    PREFETCH_CACHE_DIR,
+    PREFETCH_CACHE_MAX_BYTES,
+    PREFETCH_BANDWIDTH_LIMIT,
+    PREFETCH_MAX_CONCURRENT,
+    PREFETCH_LOOKAHEAD,
+    PREFETCH_PLAYBACK_RESERVE,
+    PREFETCH_POLL_INTERVAL,
+    DEFAULT_ITEM_DURATION,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("PrefetchScheduler")
+
+CHUNK_SIZE = 64 * 1024
+
+
+# Token bucket shared by every prefetch download so the total stays under the bandwidth cap.
+class BandwidthLimiter:
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.clock = clock
+        self._tokens = rate
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def consume(self, amount: int) -> None:
+        """Take amount bytes from the bucket, sleeping until the debt is paid back."""
+        async with self._lock:
+            now = self.clock()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+
+
+# Progress of a single prefetch download.
+@dataclass
+class PrefetchStatus:
+    url: str
+    title: str
+    deadline: float  # Clock time at which the item is expected to start playing
+    total_bytes: Optional[int] = None
+    downloaded: int = 0
+    done: bool = False
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def remaining_bytes(self) -> Optional[int]:
+        if self.total_bytes is None:
+            return None
+        return max(self.total_bytes - self.downloaded, 0)
+
+
+# Downloads upcoming playlist items ahead of their start time, within a bandwidth and concurrency budget.
+class PrefetchScheduler:
+
+    def __init__(
+        self,
+        engine,
+        cache_dir: str = PREFETCH_CACHE_DIR,
+        cache_max_bytes: int = PREFETCH_CACHE_MAX_BYTES,
+        bandwidth_limit: float = PREFETCH_BANDWIDTH_LIMIT,
+        max_concurrent: int = PREFETCH_MAX_CONCURRENT,
+        lookahead: int = PREFETCH_LOOKAHEAD,
+        playback_reserve: float = PREFETCH_PLAYBACK_RESERVE,
+        poll_interval: float = PREFETCH_POLL_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.engine = engine
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.cache_max_bytes = cache_max_bytes
+        self.bandwidth_limit = bandwidth_limit
+        self.lookahead = lookahead
+        self.playback_reserve = playback_reserve
+        self.poll_interval = poll_interval
+        self.clock = clock
+
+        self.limiter = BandwidthLimiter(bandwidth_limit, clock=clock)
+        self.playlist: List[Dict[str, str]] = []
+        self.downloads: Dict[str, PrefetchStatus] = {}
+        # Sizes learned during validation (see utils.validate_item), used before a download reports its own
+        self.content_lengths: Dict[str, int] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._task: Optional[asyncio.Task] = None
+        # Cache files of the current and upcoming items, never evicted
+        self._protected_paths: Set[str] = set()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def set_playlist(self, playlist: List[Dict[str, str]]) -> None:
+        """Set the playlist order used to find upcoming items."""
+        self.playlist = list(playlist)
+        urls = {item.get("url") for item in self.playlist}
+        for url in [url for url in self.content_lengths if url not in urls]:
+            del self.content_lengths[url]
+
+    def cache_path(self, url: str) -> str:
+        extension = os.path.splitext(httpx.URL(url).path)[1]
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + extension)
+
+    def is_cached(self, url: str) -> bool:
+        return os.path.exists(self.cache_path(url))
+
+    def resolve(self, url: str) -> str:
+        """Return the local copy of url if it has been prefetched, otherwise url itself."""
+        if url.startswith(("http://", "https://")) and self.is_cached(url):
+            path = self.cache_path(url)
+            # Mark as recently used for the cache eviction order
+            os.utime(path)
+            return pathlib.Path(path).as_uri()
+        return url
+
+    def prune_cache(self) -> None:
+        """Evict least recently used files until the cache fits in cache_max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".part"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            if path in self._protected_paths:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                logger.info(f"Evicted {path} from the prefetch cache")
+            except OSError as e:
+                logger.warning(f"Failed to evict {path}: {e}")
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        logger.info(f"Starting prefetch scheduler (limit: {self.bandwidth_limit} B/s, lookahead: {self.lookahead})")
+        self._task = self.engine.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [status.task for status in self.downloads.values() if status.task and not status.task.done()]
+        if self._task:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.schedule()
+            except Exception as e:
+                logger.error(f"Prefetch scheduling failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def upcoming(self, current_index: int, elapsed: float = 0.0) -> List[Tuple[Dict[str, str], float]]:
+        """Return the next lookahead items after current_index with their start offset in seconds."""
+        if not self.playlist:
+            return []
+
+        result = []
+        starts_in = 0.0
+        if current_index >= 0:
+            current = self.playlist[current_index]
+            starts_in = max(float(current.get("duration", DEFAULT_ITEM_DURATION)) - elapsed, 0.0)
+
+        count = min(self.lookahead, len(self.playlist) - (1 if current_index >= 0 else 0))
+        for offset in range(1, count + 1):
+            item = self.playlist[(current_index + offset) % len(self.playlist)]
+            result.append((item, starts_in))
+            starts_in += float(item.get("duration", DEFAULT_ITEM_DURATION))
+        return result
+
+    async def schedule(self) -> List[PrefetchStatus]:
+        """Start downloads for upcoming items in start-time order and return the items at risk."""
+        current_path = self.engine.current_media_path
+        current_index = next((i for i, item in enumerate(self.playlist) if item.get("url") == current_path), -1)
+        elapsed = 0.0
+        if current_index >= 0:
+            elapsed = max(await self.engine.get_time(), 0) / 1000
+
+        now = self.clock()
+        upcoming = self.upcoming(current_index, elapsed)
+        self._protected_paths = {self.cache_path(item["url"]) for item, _ in upcoming if item.get("url")}
+        if current_path:
+            self._protected_paths.add(self.cache_path(current_path))
+        self.prune_cache()
+
+        for item, starts_in in upcoming:
+            url = item.get("url", "")
+            if not url.startswith(("http://", "https://")) or self.is_cached(url):
+                continue
+
+            status = self.downloads.get(url)
+            if status:
+                status.deadline = now + starts_in
+                continue
+
+            status = PrefetchStatus(
+                url=url,
+                title=item.get("title", "Untitled"),
+                deadline=now + starts_in,
+                total_bytes=self.content_lengths.get(url),
+            )
+            self.downloads[url] = status
+            status.task = asyncio.ensure_future(self._download(status))
+
+        at_risk = self.at_risk()
+        for status in at_risk:
+            logger.warning(f"Prefetch at risk: '{status.title}' may not be ready in {status.deadline - now:.1f}s")
+        return at_risk
+
+    def at_risk(self) -> List[PrefetchStatus]:
+        """Items that cannot finish before their deadline at the current rate, served in deadline order."""
+        now = self.clock()
+        rate = self._current_rate()
+        pending = sorted((s for s in self.downloads.values() if not s.done), key=lambda s: s.deadline)
+
+        at_risk = []
+        backlog = 0
+        for status in pending:
+            remaining = status.remaining_bytes
+            if remaining is None:
+                # Size unknown until the response headers arrive, only a missed deadline is certain
+                if status.deadline <= now:
+                    at_risk.append(status)
+                continue
+            backlog += remaining
+            if now + backlog / rate > status.deadline:
+                at_risk.append(status)
+        return at_risk
+
+    def _current_rate(self) -> float:
+        # Leave part of the bandwidth to playback while a remote stream is on screen
+        current_path = self.engine.current_media_path or ""
+        if current_path.startswith(("http://", "https://")) and not self.is_cached(current_path):
+            return self.bandwidth_limit * (1 - self.playback_reserve)
+        return self.bandwidth_limit
+
+    async def _download(self, status: PrefetchStatus) -> None:
+        path = self.cache_path(status.url)
+        partial_path = path + ".part"
+        try:
+            async with self._semaphore:
+                logger.info(f"Prefetching '{status.title}' from {status.url}")
+                async with httpx.AsyncClient() as client:
+                    async with client.stream("GET", status.url, follow_redirects=True) as response:
+                        response.raise_for_status()
+                        if "content-length" in response.headers:
+                            status.total_bytes = int(response.headers["content-length"])
+
+                        with open(partial_path, "wb") as f:
+                            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                                self.limiter.rate = self._current_rate()
+                                await self.limiter.consume(len(chunk))
+                                f.write(chunk)
+                                status.downloaded += len(chunk)
+
+            os.replace(partial_path, path)
+            status.done = True
+            logger.info(f"Prefetched '{status.title}' ({status.downloaded} bytes)")
+            self.prune_cache()
+        except Exception as e:
+            logger.error(f"Failed to prefetch '{status.title}': {e}")
+        finally:
+            # Finished items are found through the cache, failed ones are retried on the next pass
+            self.downloads.pop(status.url, None)
+            if not status.done and os.path.exists(partial_path):
+                os.remove(partial_path)
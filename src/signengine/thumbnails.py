@@ -0,0 +1,192 @@
+import os
+import httpx
+import asyncio
+import hashlib
+import logging
+import subprocess
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Optional, Set
+
+from signengine.config import (
+    THUMBNAIL_CACHE_DIR,
+    THUMBNAIL_MEMORY_ITEMS,
+    THUMBNAIL_DISK_ITEMS,
+    THUMBNAIL_WORKERS,
+    THUMBNAIL_WIDTH,
+    THUMBNAIL_FRAME_OFFSET,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("Thumbnails")
+
+
+# Extract a single frame of media_path into output_path with ffmpeg. Runs in a worker process.
+def extract_frame(media_path: str, output_path: str, offset: float = THUMBNAIL_FRAME_OFFSET, width: int = THUMBNAIL_WIDTH) -> bool:
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-ss", str(offset), "-i", media_path,
+        "-frames:v", "1", "-vf", f"scale={width}:-2",
+        output_path,
+    ]
+    try:
+        subprocess.run(command, check=True, timeout=30, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return os.path.exists(output_path)
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+# Two-level LRU cache of encoded thumbnail images, bounded in memory and on disk.
+class ThumbnailCache:
+
+    def __init__(self, cache_dir: str = THUMBNAIL_CACHE_DIR, max_memory_items: int = THUMBNAIL_MEMORY_ITEMS, max_disk_items: int = THUMBNAIL_DISK_ITEMS):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Rebuild the disk LRU order from modification times, oldest first
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".jpg")]
+        self._disk: "OrderedDict[str, None]" = OrderedDict((path, None) for path in sorted(files, key=os.path.getmtime))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".jpg")
+
+    def get(self, key: str) -> Optional[bytes]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        path = self._path(key)
+        if path not in self._disk:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self._disk.pop(path, None)
+            return None
+
+        self._disk.move_to_end(path)
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        with open(path, "wb") as f:
+            f.write(data)
+        self._disk[path] = None
+        self._disk.move_to_end(path)
+        while len(self._disk) > self.max_disk_items:
+            evicted, _ = self._disk.popitem(last=False)
+            try:
+                os.remove(evicted)
+            except OSError:
+                pass
+        self._remember(key, data)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+
+# Produces thumbnails for playlist items: Pexels preview image if present, otherwise a frame extracted in a process pool.
+class ThumbnailPipeline:
+
+    def __init__(self, cache: Optional[ThumbnailCache] = None, executor: Optional[Executor] = None, workers: int = THUMBNAIL_WORKERS):
+        self.cache = cache or ThumbnailCache()
+        self.workers = workers
+        self._executor = executor
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._failed: Set[str] = set()
+        # Keys of the rows on screen, None until the GUI reports its viewport. Queued decodes for other rows are dropped.
+        self._visible: Optional[Set[str]] = None
+        # At most one queued decode per worker, so the rest can still be dropped when their row scrolls away
+        self._slots = asyncio.Semaphore(workers)
+
+    @property
+    def executor(self) -> Executor:
+        # Process pool is started on first use so browsing cached thumbnails never spawns workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def set_visible(self, items: Iterable[Dict[str, str]]) -> None:
+        """Set the items currently on screen. Decodes that have not started for any other item are skipped."""
+        self._visible = {item.get("url", "") for item in items}
+
+    def is_visible(self, key: str) -> bool:
+        return self._visible is None or key in self._visible
+
+    async def get(self, item: Dict[str, str]) -> Optional[bytes]:
+        """Return the thumbnail for a playlist item, generating it at most once."""
+        key = item.get("url", "")
+        if not key or key in self._failed:
+            return None
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        # Concurrent requests for the same item share one download or decode
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(self._generate(key, item.get("thumbnail")))
+        return await asyncio.shield(self._pending[key])
+
+    async def _generate(self, key: str, preview_url: Optional[str]) -> Optional[bytes]:
+        try:
+            data = None
+            if preview_url:
+                data = await self._download_preview(preview_url)
+            if data is None:
+                async with self._slots:
+                    if not self.is_visible(key):
+                        # Not a failure, the row is requested again when it comes back into view
+                        logger.debug(f"Skipping frame extraction for {key}, no longer visible")
+                        return None
+                    data = await self._extract(key)
+
+            if data is None:
+                logger.warning(f"No thumbnail available for {key}")
+                self._failed.add(key)
+                return None
+
+            self.cache.put(key, data)
+            return data
+        except Exception as e:
+            # Transient failures (full disk, crashed worker) are not remembered, the item is retried later
+            logger.error(f"Thumbnail generation failed for {key}: {e!r}")
+            if isinstance(e, BrokenProcessPool):
+                self._executor = None
+            return None
+        finally:
+            self._pending.pop(key, None)
+
+    async def _download_preview(self, preview_url: str) -> Optional[bytes]:
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(preview_url, timeout=10, follow_redirects=True)
+                response.raise_for_status()
+                return response.content
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to download preview image '{preview_url}': {e}")
+            return None
+
+    async def _extract(self, media_path: str) -> Optional[bytes]:
+        loop = asyncio.get_running_loop()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "frame.jpg")
+            if not await loop.run_in_executor(self.executor, extract_frame, media_path, output_path):
+                return None
+            with open(output_path, "rb") as f:
+                return f.read()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,40 +1,184 @@
 import os
+import mmap
 import logging
 import httpx
-from typing import List, Dict, AsyncGenerator, Callable
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from dataclasses import dataclass
+from typing import List, Dict, AsyncGenerator, Callable, Optional
+
+from signengine.config import VALIDATION_MODE, SNIFF_BYTES
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("Utils")
 
+# Content types that may hold playable media (application/mp4, application/x-matroska, application/dash+xml, ...).
+# The container signature decides, so only text/html error pages and the like are rejected outright.
+PLAYABLE_CONTENT_TYPES = ("video/", "audio/", "image/", "application/", "binary/octet-stream")
+
+# HEAD responses meaning the server does not support HEAD rather than the file being missing
+HEAD_REJECTED_STATUSES = (403, 405, 501)
+
+
+# Outcome of reading the first bytes of a media file.
+@dataclass
+class SniffResult:
+    valid: bool
+    container: Optional[str] = None
+    content_length: Optional[int] = None
+    bytes_read: int = 0
+
+
+# Identify the container from the first bytes of a file. None if the signature is unknown.
+def detect_container(header: bytes) -> Optional[str]:
+    if header[4:8] == b"ftyp":
+        return "mp4"
+    if header[4:8] in (b"moov", b"mdat", b"wide", b"free"):
+        return "quicktime"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "matroska"
+    if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+        return "avi"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[:4] == b"\x00\x00\x01\xba":
+        return "mpeg-ps"
+    if header[:3] == b"FLV":
+        return "flv"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:7] == b"#EXTM3U":
+        return "hls"
+    if header.lstrip()[:5] in (b"<?xml", b"<MPD ") and b"<MPD" in header:
+        return "dash"
+    if header[:3] == b"ID3" or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if header[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    # Transport stream packets are 188 bytes long and all start with a 0x47 sync byte
+    if header[:1] == b"\x47" and header[188:189] == b"\x47":
+        return "mpegts"
+    return None
+
+
+# Filesystem path of a local item, decoding file: URIs such as the percent-encoded ones from Path.as_uri().
+def _local_path(url: str) -> str:
+    if not url.startswith("file:"):
+        return url
+    parsed = urlparse(url)
+    # file://server/share/... names a UNC path, file:///... and file://localhost/... a local one
+    if parsed.netloc and parsed.netloc != "localhost":
+        return url2pathname(f"//{parsed.netloc}{parsed.path}")
+    return url2pathname(parsed.path)
+
+
+# Total size of the remote file from a ranged (Content-Range) or plain (Content-Length) response.
+def _content_length(response: httpx.Response) -> Optional[int]:
+    content_range = response.headers.get("content-range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    if response.status_code == 200 and response.headers.get("content-length", "").isdigit():
+        return int(response.headers["content-length"])
+    return None
+
+
+# Read at most max_bytes of a remote file with a ranged GET and check its content type and container signature.
+async def sniff_remote_url(url: str, max_bytes: int = SNIFF_BYTES) -> SniffResult:
+    headers = {"Range": f"bytes=0-{max_bytes - 1}", "Accept-Encoding": "identity"}
+    try:
+        async with httpx.AsyncClient() as client:
+            async with client.stream("GET", url, headers=headers, timeout=5, follow_redirects=True) as response:
+                if response.status_code not in (200, 206):
+                    logger.warning(f"Sniffing '{url}' failed with status {response.status_code}")
+                    return SniffResult(valid=False)
+
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type and not content_type.startswith(PLAYABLE_CONTENT_TYPES):
+                    logger.warning(f"Unplayable content type for '{url}': {content_type}")
+                    return SniffResult(valid=False)
+
+                # Servers ignoring the Range header send the whole file, stop reading at the budget
+                header = b""
+                async for chunk in response.aiter_bytes(max_bytes):
+                    header += chunk[:max_bytes - len(header)]
+                    if len(header) >= max_bytes:
+                        break
+
+                container = detect_container(header)
+                if not container:
+                    logger.warning(f"Unknown container signature for '{url}'")
+                return SniffResult(container is not None, container, _content_length(response), len(header))
+    except httpx.RequestError as e:
+        logger.warning(f"Failed to sniff remote URL '{url}': {e}")
+        return SniffResult(valid=False)
+
+
+# Check the container signature of a local file through an mmap'd read of its first max_bytes.
+def sniff_local_path(path: str, max_bytes: int = SNIFF_BYTES) -> SniffResult:
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return SniffResult(valid=False, content_length=0)
+            with mmap.mmap(f.fileno(), min(size, max_bytes), access=mmap.ACCESS_READ) as mapped:
+                header = mapped[:]
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read local file '{path}': {e}")
+        return SniffResult(valid=False)
+
+    container = detect_container(header)
+    if not container:
+        logger.warning(f"Unknown container signature for '{path}'")
+    return SniffResult(container is not None, container, size, len(header))
+
+
 # Check if a remote URL is accessible. True if it is.
 async def check_remote_url(url: str) -> bool:
     try:
         async with httpx.AsyncClient() as client:
             response = await client.head(url, timeout=5, follow_redirects=True)
-            return response.status_code == 200
     except httpx.RequestError as e:
         logger.warning(f"Failed to check remote URL '{url}': {e}")
         return False
 
+    if response.status_code in HEAD_REJECTED_STATUSES:
+        logger.info(f"HEAD rejected for '{url}' ({response.status_code}), falling back to a ranged GET")
+        return (await sniff_remote_url(url)).valid
+    return response.status_code == 200
+
 # Validate a single playlist item. True if the item is valid (file exists or URL is accessible).
-async def validate_item(item: Dict[str, str]) -> bool:
+# In "sniff" mode the first bytes are read to confirm the container. Sizes are stored in content_lengths (keyed
+# by URL) when given, the item itself is never modified since the playlist state compares items by value.
+async def validate_item(item: Dict[str, str], mode: str = VALIDATION_MODE, content_lengths: Optional[Dict[str, int]] = None) -> bool:
     url = item.get("url", "")
     if not url:
         logger.warning(f"Item missing URL: {item}")
         return False
 
-    if url.startswith(("http://", "https://")):
-        return await check_remote_url(url)
-    return os.path.exists(url)
+    is_remote = url.startswith(("http://", "https://"))
+    if mode != "sniff":
+        if is_remote:
+            return await check_remote_url(url)
+        return os.path.exists(_local_path(url))
+
+    result = await sniff_remote_url(url) if is_remote else sniff_local_path(_local_path(url))
+    if result.content_length is not None and content_lengths is not None:
+        content_lengths[url] = result.content_length
+    return result.valid
 
 # Validate all items in the playlist asynchronously.
-async def validate_playlist(playlist: List[Dict[str, str]]) -> List[Dict[str, str]]:
+async def validate_playlist(playlist: List[Dict[str, str]], mode: str = VALIDATION_MODE, content_lengths: Optional[Dict[str, int]] = None) -> List[Dict[str, str]]:
     logger.info("Validating playlist...")
     valid_items = []
 
     for item in playlist:
-        if "title" in item and "url" in item and await validate_item(item):
+        if "title" in item and "url" in item and await validate_item(item, mode, content_lengths):
             valid_items.append(item)
 
     logger.info(f"Validation complete. {len(valid_items)} valid items found.")
@@ -0,0 +1,238 @@
+import vlc
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Dict, Optional, Callable
+
+from signengine.config import (
+    WATCHDOG_POLL_INTERVAL,
+    WATCHDOG_STALL_WINDOW,
+    WATCHDOG_MAX_BACKOFF,
+    WATCHDOG_MAX_INCIDENTS,
+    WATCHDOG_MAX_CANDIDATES,
+    WATCHDOG_RECOVERY_BUDGET,
+    FALLBACK_MEDIA_PATH,
+)
+from signengine.utils import validate_item
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("PlaybackWatchdog")
+
+# States where VLC is expected to make progress. Paused/Stopped are operator-initiated and never count as stalls.
+WAITING_STATES = (vlc.State.NothingSpecial, vlc.State.Opening, vlc.State.Buffering, vlc.State.Playing)
+
+
+# A single playback failure detected by the watchdog.
+@dataclass
+class Incident:
+    media_path: str
+    reason: str  # "stall", "error", or "ended" when the playlist has nothing left to play
+    detected_at: float  # Wall-clock timestamp of the detection
+    stalled_for: float  # Seconds between the last observed progress and the detection
+    recovered_with: Optional[str] = None  # Media path played instead, None if nothing could be played
+    recovery_time: Optional[float] = None  # Seconds spent finding and starting the replacement
+
+
+# Polls a PlaybackEngine for progress and skips to the next valid item when playback stalls, errors or ends.
+class PlaybackWatchdog:
+
+    def __init__(
+        self,
+        engine,
+        stall_window: float = WATCHDOG_STALL_WINDOW,
+        poll_interval: float = WATCHDOG_POLL_INTERVAL,
+        fallback_path: Optional[str] = FALLBACK_MEDIA_PATH,
+        max_candidates: int = WATCHDOG_MAX_CANDIDATES,
+        recovery_budget: float = WATCHDOG_RECOVERY_BUDGET,
+        is_cached: Optional[Callable[[str], bool]] = None,
+        content_lengths: Optional[Dict[str, int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.engine = engine
+        self.stall_window = stall_window
+        self.poll_interval = poll_interval
+        self.fallback_path = fallback_path
+        # Recovery checks a few items concurrently within a time budget, never the whole playlist in turn
+        self.max_candidates = max_candidates
+        self.recovery_budget = recovery_budget
+        # Items with a local copy (e.g. PrefetchScheduler.is_cached) play without a network check
+        self.is_cached = is_cached
+        # Filled with the sizes found while validating, e.g. PrefetchScheduler.content_lengths
+        self.content_lengths = content_lengths
+        self.clock = clock
+
+        self.playlist: List[Dict[str, str]] = []
+        self.incidents: Deque[Incident] = deque(maxlen=WATCHDOG_MAX_INCIDENTS)
+        self._task: Optional[asyncio.Task] = None
+
+        # Progress tracking for the media currently loaded
+        self._tracked_path: Optional[str] = None
+        self._last_time: Optional[int] = None
+        self._last_progress: float = 0.0
+
+        # Backoff after an unrecoverable incident, so a dead item is not re-validated on every poll
+        self._failed_path: Optional[str] = None
+        self._failed_state: Optional[vlc.State] = None
+        self._retry_at: float = 0.0
+        self._backoff: float = stall_window
+
+    def set_playlist(self, playlist: List[Dict[str, str]]) -> None:
+        """Set the playlist order used to pick the next item on recovery."""
+        self.playlist = list(playlist)
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        logger.info(f"Starting watchdog (stall window: {self.stall_window}s, poll interval: {self.poll_interval}s)")
+        self._task = self.engine.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Watchdog check failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def check(self) -> Optional[Incident]:
+        """Run a single progress check. Returns the incident if one was detected."""
+        media_path = self.engine.current_media_path
+        if not media_path:
+            return None
+
+        now = self.clock()
+        if media_path != self._tracked_path:
+            self._reset_tracking(media_path, now)
+            self._clear_backoff()
+
+        state = await self.engine.get_state()
+        if media_path == self._failed_path:
+            if state == self._failed_state and now < self._retry_at:
+                return None
+            if state != self._failed_state:
+                self._clear_backoff()
+
+        if state == vlc.State.Error:
+            return await self._recover(media_path, "error", state, now)
+        if state == vlc.State.Ended:
+            return await self._recover(media_path, "ended", state, now)
+        if state not in WAITING_STATES:
+            self._last_progress = now
+            return None
+
+        if state == vlc.State.Playing:
+            current_time = await self.engine.get_time()
+            if current_time >= 0 and current_time != self._last_time:
+                self._last_time = current_time
+                self._last_progress = now
+                return None
+
+        if now - self._last_progress >= self.stall_window:
+            return await self._recover(media_path, "stall", state, now)
+        return None
+
+    def _reset_tracking(self, media_path: Optional[str], now: float) -> None:
+        self._tracked_path = media_path
+        self._last_time = None
+        self._last_progress = now
+
+    def _clear_backoff(self) -> None:
+        self._failed_path = None
+        self._failed_state = None
+        self._backoff = self.stall_window
+
+    async def _recover(self, media_path: str, reason: str, state: vlc.State, now: float) -> Optional[Incident]:
+        """Play the next valid item. Normal end-of-item advances are not recorded as incidents."""
+        incident = Incident(
+            media_path=media_path,
+            reason=reason,
+            detected_at=time.time(),
+            stalled_for=now - self._last_progress,
+        )
+        if reason == "ended":
+            logger.info(f"Playback ended for {media_path}, advancing")
+        else:
+            logger.warning(f"Playback {reason} detected for {media_path} after {incident.stalled_for:.1f}s without progress")
+
+        if reason == "error":
+            self.engine.discard_media(media_path)
+
+        started = self.clock()
+        replacement = await self._next_valid_item(media_path, include_current=reason == "ended")
+        if not replacement and self.fallback_path:
+            logger.warning(f"No valid playlist item found, falling back to {self.fallback_path}")
+            replacement = self.fallback_path
+
+        if replacement:
+            await self.engine.play(replacement)
+            incident.recovered_with = replacement
+            incident.recovery_time = self.clock() - started
+            self._clear_backoff()
+            if reason != "ended":
+                logger.info(f"Recovered with {replacement} in {incident.recovery_time:.2f}s")
+        else:
+            logger.error(f"No valid item or fallback available, retrying in {self._backoff:.0f}s")
+            self._failed_path = media_path
+            self._failed_state = state
+            self._retry_at = self.clock() + self._backoff
+            self._backoff = min(self._backoff * 2, WATCHDOG_MAX_BACKOFF)
+
+        # Start a fresh stall window for whatever is loaded now, even if it is the same path
+        self._reset_tracking(self.engine.current_media_path, self.clock())
+        if reason == "ended" and replacement:
+            return None
+        self.incidents.append(incident)
+        return incident
+
+    async def _next_valid_item(self, media_path: str, include_current: bool) -> Optional[str]:
+        """Return the first of the next max_candidates items after media_path that validates within the budget."""
+        index = next((i for i, item in enumerate(self.playlist) if item.get("url") == media_path), -1)
+        candidates = self.playlist[index + 1:] + self.playlist[:index + 1]
+        if not include_current and index >= 0:
+            candidates = candidates[:-1]
+        candidates = candidates[:self.max_candidates]
+        if not candidates:
+            return None
+
+        # All candidates are checked at once, the earliest valid one in playlist order wins
+        checks = [asyncio.ensure_future(self._is_valid(item)) for item in candidates]
+        pending = set(checks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.recovery_budget
+        try:
+            while pending:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    logger.warning(f"Candidate checks exceeded the {self.recovery_budget}s recovery budget")
+                    break
+                _, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for item, check in zip(candidates, checks):
+                    if not check.done():
+                        break
+                    if not check.exception() and check.result():
+                        return item["url"]
+        finally:
+            for check in pending:
+                check.cancel()
+
+        for item, check in zip(candidates, checks):
+            if check.done():
+                logger.warning(f"Skipping invalid item: {item.get('title', 'Untitled')}")
+        return None
+
+    async def _is_valid(self, item: Dict[str, str]) -> bool:
+        if self.is_cached and self.is_cached(item.get("url", "")):
+            return True
+        return await validate_item(item, content_lengths=self.content_lengths)
@@ -0,0 +1,17 @@
+import pytest
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# Fixture: Clock injected into the watchdog and prefetch scheduler, advanced by the test
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import Mock
+from signengine.media_cache import MediaCache
+
+URLS = [f"http://example.com/video{i}.mp4" for i in range(4)]
+
+
+# Fixture: VLC instance creating a distinct mock media per call
+@pytest.fixture
+def mock_instance():
+    instance = Mock()
+    instance.media_new.side_effect = lambda mrl: Mock(name=mrl)
+    return instance
+
+
+@pytest.fixture
+def cache(mock_instance):
+    return MediaCache(mock_instance, max_items=2)
+
+
+def test_media_cache_reuses_media(mock_instance, cache):
+    """Test that repeated URLs reuse the parsed media."""
+    first = cache.get(URLS[0])
+    second = cache.get(URLS[0])
+
+    assert first is second
+    mock_instance.media_new.assert_called_once_with(URLS[0])
+
+
+def test_media_cache_releases_evicted_media(cache):
+    """Test that the least recently used media is released once the cache is full."""
+    media = [cache.get(url) for url in URLS[:2]]
+    cache.get(URLS[0])
+    cache.get(URLS[2])
+
+    assert len(cache) == 2
+    media[1].release.assert_called_once()
+    media[0].release.assert_not_called()
+
+
+def test_media_cache_keeps_at_least_one_item(mock_instance):
+    """Test that a zero-sized cache still hands out unreleased media."""
+    cache = MediaCache(mock_instance, max_items=0)
+
+    media = cache.get(URLS[0])
+
+    media.release.assert_not_called()
+
+
+def test_media_cache_discard_and_clear(cache):
+    """Test that discarded and cleared media are released."""
+    media = [cache.get(url) for url in URLS[:2]]
+
+    cache.discard(URLS[0])
+    media[0].release.assert_called_once()
+
+    cache.clear()
+    media[1].release.assert_called_once()
+    assert len(cache) == 0
+
+
+def test_media_cache_handles_failed_media(mock_instance, cache):
+    """Test that a failed media_new is not cached."""
+    mock_instance.media_new.side_effect = lambda mrl: None
+
+    assert cache.get(URLS[0]) is None
+    assert len(cache) == 0
@@ -12,7 +12,7 @@ async def test_fetch_videos_success(mocker):
     # Mock response data
     mock_response_data = {
         "videos": [
-            {"id": 1, "video_files": [{"link": "http://example.com/video1.mp4"}]},
+            {"id": 1, "image": "http://example.com/video1.jpg", "video_files": [{"link": "http://example.com/video1.mp4"}]},
             {"id": 2, "video_files": [{"link": "http://example.com/video2.mp4"}]},
         ]
     }
@@ -29,6 +29,8 @@ async def test_fetch_videos_success(mocker):
     assert len(results) == 2
     assert results[0]["url"] == "http://example.com/video1.mp4"
     assert results[1]["url"] == "http://example.com/video2.mp4"
+    assert results[0]["thumbnail"] == "http://example.com/video1.jpg"
+    assert results[1]["thumbnail"] == ""
 
 @pytest.mark.asyncio
 async def test_fetch_videos_invalid_api_key(mocker):
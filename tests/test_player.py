@@ -162,4 +162,61 @@ async def test_playback_engine_handles_exceptions(mocker, playback_engine):
         "signengine.player.vlc.MediaPlayer.play", side_effect=Exception("Unexpected Error")
     )
     result = await playback_engine.play(MEDIA_PATH)
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+# Test: Media reuse
+@pytest.mark.asyncio
+async def test_playback_engine_reuses_media(mock_vlc, playback_engine):
+    """Test that returning to a URL reuses the cached media instead of creating a new one."""
+    mock_vlc_instance, mock_media_player, _ = mock_vlc
+
+    await playback_engine.play(MEDIA_PATH)
+    await playback_engine.play("http://example.com/new_video.mp4")
+    await playback_engine.play(MEDIA_PATH)
+
+    assert mock_vlc_instance.media_new.call_count == 2
+    assert mock_media_player.set_media.call_count == 3
+
+
+# Test: Shutdown
+@pytest.mark.asyncio
+async def test_playback_engine_close(mock_vlc, playback_engine):
+    """Test that close releases the media, the player and the instance."""
+    mock_vlc_instance, mock_media_player, mock_media = mock_vlc
+    await playback_engine.play(MEDIA_PATH)
+
+    playback_engine.close()
+
+    mock_media_player.stop.assert_called()
+    mock_media_player.release.assert_called_once()
+    mock_media.release.assert_called_once()
+    mock_vlc_instance.release.assert_called_once()
+
+
+# Test: No retained media references
+@pytest.mark.asyncio
+async def test_playback_engine_restart_without_get_media(mock_vlc, playback_engine):
+    """Test that replaying the current media restarts it without calling get_media(), which retains a reference."""
+    mock_vlc_instance, mock_media_player, _ = mock_vlc
+
+    await playback_engine.play(MEDIA_PATH)
+    await playback_engine.play(MEDIA_PATH)
+
+    mock_media_player.get_media.assert_not_called()
+    mock_media_player.set_media.assert_called_once()
+    assert mock_media_player.play.call_count == 2
+    mock_vlc_instance.media_new.assert_called_once_with(MEDIA_PATH)
+
+
+# Test: Discarded media is loaded again
+@pytest.mark.asyncio
+async def test_playback_engine_reloads_after_discard(mock_vlc, playback_engine):
+    """Test that playing an item again after discard_media() creates and sets a new media."""
+    mock_vlc_instance, mock_media_player, _ = mock_vlc
+
+    await playback_engine.play(MEDIA_PATH)
+    playback_engine.discard_media(MEDIA_PATH)
+    await playback_engine.play(MEDIA_PATH)
+
+    assert mock_vlc_instance.media_new.call_count == 2
+    assert mock_media_player.set_media.call_count == 2
@@ -0,0 +1,86 @@
+import pytest
+from signengine.playlist_state import PlaylistState, item_id
+
+PLAYLIST = [
+    {"title": "Video 1", "url": "http://example.com/video1.mp4"},
+    {"title": "Video 2", "url": "http://example.com/video2.mp4"},
+    {"title": "Video 3", "url": "http://example.com/video3.mp4"},
+    {"title": "Video 4", "url": "http://example.com/video4.mp4"},
+]
+NEW_ITEM = {"title": "Video 5", "url": "http://example.com/video5.mp4"}
+
+
+def apply_changes(rows, changes):
+    """Apply changes to a list of titles the way the GUI applies them to the list widget."""
+    rows = list(rows)
+    for change in changes:
+        if change.action == "remove":
+            del rows[change.row]
+        elif change.action == "insert":
+            rows.insert(change.row, change.item["title"])
+        else:
+            rows[change.row] = change.item["title"]
+    return rows
+
+
+def titles(playlist):
+    return [item["title"] for item in playlist]
+
+
+# Fixture: State already showing PLAYLIST
+@pytest.fixture
+def state():
+    state = PlaylistState()
+    state.update(PLAYLIST)
+    return state
+
+
+def test_item_id_prefers_api_id():
+    """Test that an explicit id wins over the URL."""
+    assert item_id({"id": 42, "url": "http://example.com/video.mp4"}) == "42"
+    assert item_id({"url": "http://example.com/video.mp4"}) == "http://example.com/video.mp4"
+
+
+def test_initial_load_inserts_every_row():
+    """Test that the first load inserts all items in order."""
+    changes = PlaylistState().update(PLAYLIST)
+
+    assert [change.action for change in changes] == ["insert"] * len(PLAYLIST)
+    assert apply_changes([], changes) == titles(PLAYLIST)
+
+
+def test_unchanged_playlist_has_no_changes(state):
+    """Test that reloading the same playlist touches no rows."""
+    assert state.update([dict(item) for item in PLAYLIST]) == []
+
+
+@pytest.mark.parametrize(
+    "new_playlist,expected_changes",
+    [
+        (PLAYLIST[:2] + [NEW_ITEM] + PLAYLIST[2:], 1),  # Insert in the middle
+        (PLAYLIST[:1] + PLAYLIST[2:], 1),  # Remove one item
+        (PLAYLIST[:3] + [{**PLAYLIST[3], "title": "Renamed"}], 1),  # Title update keeps the row
+        (PLAYLIST[1:] + PLAYLIST[:1], 2),  # Move first item to the end
+        ([NEW_ITEM] + PLAYLIST[::-1], None),  # Larger reshuffle
+    ],
+)
+def test_update_applies_minimal_changes(state, new_playlist, expected_changes):
+    """Test that only changed rows are touched and applying the changes yields the new playlist."""
+    changes = state.update(new_playlist)
+
+    if expected_changes is not None:
+        assert len(changes) == expected_changes
+    assert apply_changes(titles(PLAYLIST), changes) == titles(new_playlist)
+    assert state.items == new_playlist
+
+
+def test_update_handles_repeated_items(state):
+    """Test that an item scheduled twice keeps one row per occurrence."""
+    new_playlist = PLAYLIST + [PLAYLIST[0]]
+
+    changes = state.update(new_playlist)
+
+    assert len(changes) == 1
+    assert changes[0].action == "insert"
+    assert changes[0].row == len(PLAYLIST)
+    assert apply_changes(titles(PLAYLIST), changes) == titles(new_playlist)
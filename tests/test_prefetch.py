@@ -0,0 +1,192 @@
+import pytest
+import asyncio
+import os
+import httpx
+import pathlib
+from unittest.mock import Mock, AsyncMock
+from signengine.prefetch import PrefetchScheduler, PrefetchStatus, BandwidthLimiter
+
+PLAYLIST = [
+    {"title": "Video 1", "url": "http://example.com/video1.mp4", "duration": 10},
+    {"title": "Video 2", "url": "http://example.com/video2.mp4", "duration": 20},
+    {"title": "Video 3", "url": "http://example.com/video3.mp4", "duration": 30},
+    {"title": "Video 4", "url": "http://example.com/video4.mp4", "duration": 40},
+]
+BANDWIDTH_LIMIT = 1000
+
+
+class FakeStream:
+    """Async context manager standing in for httpx.AsyncClient.stream."""
+
+    def __init__(self, chunks, status_code=200):
+        self.chunks = chunks
+        self.status_code = status_code
+        self.headers = {"content-length": str(sum(len(chunk) for chunk in chunks))}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise httpx.HTTPStatusError("HTTP Error", request=None, response=None)
+
+    async def aiter_bytes(self, chunk_size=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+# Fixture: Fake PlaybackEngine streaming the first item, 4s in
+@pytest.fixture
+def mock_engine():
+    engine = Mock()
+    engine.current_media_path = PLAYLIST[0]["url"]
+    engine.get_time = AsyncMock(return_value=4000)
+    return engine
+
+
+@pytest.fixture
+def scheduler(mock_engine, clock, tmp_path):
+    scheduler = PrefetchScheduler(
+        mock_engine,
+        cache_dir=str(tmp_path),
+        bandwidth_limit=BANDWIDTH_LIMIT,
+        max_concurrent=1,
+        lookahead=2,
+        playback_reserve=0.5,
+        clock=clock,
+    )
+    scheduler.set_playlist(PLAYLIST)
+    return scheduler
+
+
+def test_upcoming_uses_playlist_order_and_durations(scheduler):
+    """Test that upcoming items follow the playlist and start after the remaining time of the current one."""
+    upcoming = scheduler.upcoming(current_index=0, elapsed=4.0)
+
+    assert [(item["title"], starts_in) for item, starts_in in upcoming] == [("Video 2", 6.0), ("Video 3", 26.0)]
+
+
+def test_upcoming_wraps_around(scheduler):
+    """Test that the lookahead continues from the start of the playlist after the last item."""
+    upcoming = scheduler.upcoming(current_index=3)
+
+    assert [item["title"] for item, _ in upcoming] == ["Video 1", "Video 2"]
+
+
+@pytest.mark.asyncio
+async def test_schedule_downloads_upcoming_items(mocker, scheduler):
+    """Test that scheduled items are downloaded to the cache and resolved to local copies."""
+    stream = mocker.patch("httpx.AsyncClient.stream", side_effect=lambda *args, **kwargs: FakeStream([b"data"]))
+    mocker.patch.object(BandwidthLimiter, "consume", AsyncMock())
+
+    await scheduler.schedule()
+    await asyncio.gather(*[status.task for status in scheduler.downloads.values()])
+
+    assert [call.args[1] for call in stream.call_args_list] == [PLAYLIST[1]["url"], PLAYLIST[2]["url"]]
+    assert scheduler.downloads == {}
+    assert scheduler.resolve(PLAYLIST[1]["url"]) == pathlib.Path(scheduler.cache_path(PLAYLIST[1]["url"])).as_uri()
+    with open(scheduler.cache_path(PLAYLIST[2]["url"]), "rb") as f:
+        assert f.read() == b"data"
+
+
+@pytest.mark.asyncio
+async def test_schedule_skips_cached_items(mocker, scheduler):
+    """Test that items already in the cache are not downloaded again."""
+    open(scheduler.cache_path(PLAYLIST[1]["url"]), "wb").close()
+    mocker.patch.object(PrefetchScheduler, "_download", AsyncMock())
+
+    await scheduler.schedule()
+
+    assert list(scheduler.downloads) == [PLAYLIST[2]["url"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_download_is_retried(mocker, scheduler):
+    """Test that a failed download leaves no partial file and is scheduled again."""
+    mocker.patch("httpx.AsyncClient.stream", return_value=FakeStream([b"data"], status_code=500))
+    scheduler.lookahead = 1
+
+    await scheduler.schedule()
+    await scheduler.downloads[PLAYLIST[1]["url"]].task
+
+    assert scheduler.downloads == {}
+    assert not scheduler.is_cached(PLAYLIST[1]["url"])
+    assert scheduler.resolve(PLAYLIST[1]["url"]) == PLAYLIST[1]["url"]
+
+
+def test_resolve_returns_valid_file_uri(tmp_path, mock_engine):
+    """Test that cached paths with spaces are percent-encoded in the returned MRL."""
+    scheduler = PrefetchScheduler(mock_engine, cache_dir=str(tmp_path / "prefetch cache"))
+    open(scheduler.cache_path(PLAYLIST[1]["url"]), "wb").close()
+
+    mrl = scheduler.resolve(PLAYLIST[1]["url"])
+
+    assert mrl.startswith("file:///")
+    assert "prefetch%20cache" in mrl
+
+
+@pytest.mark.asyncio
+async def test_schedule_evicts_old_files_but_keeps_current_and_upcoming(mocker, scheduler):
+    """Test that the cache is kept under its byte cap without evicting items that are about to play."""
+    mocker.patch.object(PrefetchScheduler, "_download", AsyncMock())
+    scheduler.cache_max_bytes = 250
+    stale = [os.path.join(scheduler.cache_dir, f"stale{i}.mp4") for i in range(3)]
+    needed = [scheduler.cache_path(item["url"]) for item in PLAYLIST[:3]]
+    for age, path in enumerate(stale + needed):
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 100)
+        os.utime(path, (age, age))
+
+    await scheduler.schedule()
+
+    assert [os.path.exists(path) for path in stale] == [False, False, False]
+    assert all(os.path.exists(path) for path in needed)
+
+
+@pytest.mark.asyncio
+async def test_schedule_uses_sizes_from_validation(mocker, scheduler):
+    """Test that sizes recorded during validation seed the estimate and are dropped with their items."""
+    mocker.patch.object(PrefetchScheduler, "_download", AsyncMock())
+    scheduler.content_lengths.update({PLAYLIST[1]["url"]: 1234, "http://example.com/gone.mp4": 1})
+    scheduler.set_playlist(PLAYLIST)
+
+    await scheduler.schedule()
+
+    assert scheduler.downloads[PLAYLIST[1]["url"]].total_bytes == 1234
+    assert scheduler.content_lengths == {PLAYLIST[1]["url"]: 1234}
+
+
+def test_at_risk_accounts_for_earlier_deadlines(scheduler):
+    """Test that items queued behind earlier downloads are reported when the budget cannot cover them."""
+    # Remote stream playing: half of the 1000 B/s budget is left to prefetching
+    first = PrefetchStatus(url="a", title="A", deadline=10.0, total_bytes=4000)
+    second = PrefetchStatus(url="b", title="B", deadline=12.0, total_bytes=2500)
+    scheduler.downloads = {"a": first, "b": second}
+
+    assert scheduler.at_risk() == [second]
+
+
+def test_at_risk_yields_to_playback_only_when_streaming(mock_engine, scheduler):
+    """Test that the full budget is used once the current item plays from the cache."""
+    status = PrefetchStatus(url="a", title="A", deadline=6.0, total_bytes=5000)
+    scheduler.downloads = {"a": status}
+    assert scheduler.at_risk() == [status]
+
+    open(scheduler.cache_path(mock_engine.current_media_path), "wb").close()
+    assert scheduler.at_risk() == []
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_limiter_sleeps_when_over_budget(mocker, clock):
+    """Test that consuming more than the bucket holds waits for the debt to be repaid."""
+    sleep = mocker.patch("signengine.prefetch.asyncio.sleep", AsyncMock())
+    limiter = BandwidthLimiter(rate=BANDWIDTH_LIMIT, clock=clock)
+
+    await limiter.consume(500)
+    sleep.assert_not_called()
+
+    await limiter.consume(1500)
+    sleep.assert_awaited_once_with(1.0)
@@ -0,0 +1,195 @@
+import os
+import stat
+import pytest
+import asyncio
+import httpx
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, AsyncMock
+from signengine.thumbnails import ThumbnailCache, ThumbnailPipeline, extract_frame
+
+PREVIEW_ITEM = {"title": "Pexels Video", "url": "http://example.com/video1.mp4", "thumbnail": "http://example.com/video1.jpg"}
+PLAIN_ITEM = {"title": "Plain Video", "url": "http://example.com/video2.mp4"}
+PREVIEW_DATA = b"preview-jpeg"
+FRAME_DATA = b"frame-jpeg"
+
+
+class MockResponse:
+    """Simulates an HTTP response for testing purposes."""
+
+    def __init__(self, content=b"", status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise httpx.HTTPStatusError("HTTP Error", request=None, response=None)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ThumbnailCache(cache_dir=str(tmp_path), max_memory_items=2, max_disk_items=3)
+
+
+# Fixture: Pipeline whose frame extraction is replaced by an AsyncMock
+@pytest.fixture
+def pipeline(mocker, cache):
+    pipeline = ThumbnailPipeline(cache=cache, executor=Mock())
+    mocker.patch.object(pipeline, "_extract", AsyncMock(return_value=FRAME_DATA))
+    return pipeline
+
+
+def test_cache_evicts_least_recently_used(cache):
+    """Test that memory and disk tiers both drop their least recently used entries."""
+    for key in ["a", "b", "c"]:
+        cache.put(key, key.encode())
+    cache.get("a")
+    cache.put("d", b"d")
+
+    assert list(cache._memory) == ["a", "d"]
+    assert cache.get("b") is None
+    assert cache.get("c") == b"c"
+
+
+def test_cache_survives_restart(cache):
+    """Test that thumbnails written to disk are found by a new cache instance."""
+    cache.put("a", b"a")
+
+    reloaded = ThumbnailCache(cache_dir=cache.cache_dir, max_memory_items=2, max_disk_items=3)
+
+    assert reloaded.get("a") == b"a"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_prefers_pexels_preview(mocker, pipeline):
+    """Test that an item with a preview image is downloaded instead of decoded."""
+    get = mocker.patch("httpx.AsyncClient.get", return_value=MockResponse(content=PREVIEW_DATA))
+
+    data = await pipeline.get(PREVIEW_ITEM)
+
+    assert data == PREVIEW_DATA
+    get.assert_called_once()
+    pipeline._extract.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_extracts_frame_when_preview_fails(mocker, pipeline):
+    """Test that a failed preview download falls back to frame extraction."""
+    mocker.patch("httpx.AsyncClient.get", return_value=MockResponse(status_code=404))
+
+    data = await pipeline.get(PREVIEW_ITEM)
+
+    assert data == FRAME_DATA
+    pipeline._extract.assert_awaited_once_with(PREVIEW_ITEM["url"])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_decodes_each_item_once(pipeline):
+    """Test that concurrent and repeated requests share a single decode."""
+    results = await asyncio.gather(*[pipeline.get(PLAIN_ITEM) for _ in range(5)])
+    assert await pipeline.get(PLAIN_ITEM) == FRAME_DATA
+
+    assert results == [FRAME_DATA] * 5
+    pipeline._extract.assert_awaited_once()
+    assert pipeline._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_does_not_retry_failed_items(pipeline):
+    """Test that an item without any thumbnail is not decoded again on every scroll."""
+    pipeline._extract.return_value = None
+
+    assert await pipeline.get(PLAIN_ITEM) is None
+    assert await pipeline.get(PLAIN_ITEM) is None
+
+    pipeline._extract.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_survives_cache_write_failure(mocker, pipeline):
+    """Test that a full disk is logged and the item is retried later instead of being marked failed."""
+    mocker.patch.object(pipeline.cache, "put", side_effect=OSError("No space left on device"))
+
+    assert await pipeline.get(PLAIN_ITEM) is None
+
+    assert pipeline._pending == {}
+    assert PLAIN_ITEM["url"] not in pipeline._failed
+
+
+@pytest.mark.asyncio
+async def test_pipeline_replaces_broken_process_pool(pipeline):
+    """Test that a crashed worker pool is dropped so the next request starts a new one."""
+    pipeline._extract.side_effect = BrokenProcessPool("worker died")
+
+    assert await pipeline.get(PLAIN_ITEM) is None
+
+    assert pipeline._executor is None
+    assert PLAIN_ITEM["url"] not in pipeline._failed
+
+
+# Fixture: Fake ffmpeg on PATH that writes its last argument as the extracted frame
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text('#!/bin/sh\nfor last; do :; done\nprintf frame-jpeg > "$last"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return script
+
+
+def test_extract_frame(fake_ffmpeg, tmp_path):
+    """Test that extract_frame reports success only when ffmpeg produced the frame."""
+    output_path = str(tmp_path / "frame.jpg")
+
+    assert extract_frame("http://example.com/video.mp4", output_path)
+    with open(output_path, "rb") as f:
+        assert f.read() == FRAME_DATA
+
+
+def test_extract_frame_without_ffmpeg(monkeypatch, tmp_path):
+    """Test that a missing ffmpeg binary is reported as a failed extraction."""
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert not extract_frame("http://example.com/video.mp4", str(tmp_path / "frame.jpg"))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_extracts_frame_in_process_pool(fake_ffmpeg, cache):
+    """Test the frame extraction path end to end through a real process pool."""
+    executor = ProcessPoolExecutor(max_workers=1)
+    pipeline = ThumbnailPipeline(cache=cache, executor=executor)
+    try:
+        assert await pipeline.get(PLAIN_ITEM) == FRAME_DATA
+        assert cache.get(PLAIN_ITEM["url"]) == FRAME_DATA
+    finally:
+        pipeline.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_rows_scrolled_out_of_view(cache):
+    """Test that queued decodes for rows no longer on screen never reach the process pool."""
+    items = [{"title": f"Video {i}", "url": f"http://example.com/video{i}.mp4"} for i in range(6)]
+    pipeline = ThumbnailPipeline(cache=cache, executor=Mock(), workers=1)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def extract(media_path):
+        started.set()
+        await release.wait()
+        return FRAME_DATA
+
+    pipeline._extract = AsyncMock(side_effect=extract)
+
+    pipeline.set_visible(items[:3])
+    stale = [asyncio.ensure_future(pipeline.get(item)) for item in items[:3]]
+    await started.wait()
+    pipeline.set_visible(items[3:])
+    fresh = [asyncio.ensure_future(pipeline.get(item)) for item in items[3:]]
+    release.set()
+
+    assert await asyncio.gather(*stale) == [FRAME_DATA, None, None]
+    assert await asyncio.gather(*fresh) == [FRAME_DATA] * 3
+    # The first row had already started decoding, the other stale rows were dropped and not marked failed
+    assert [call.args[0] for call in pipeline._extract.await_args_list] == [item["url"] for item in items[:1] + items[3:]]
+    assert pipeline._failed == set()
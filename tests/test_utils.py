@@ -1,5 +1,44 @@
 import pytest
-from signengine.utils import validate_playlist
+import httpx
+from signengine.utils import (
+    validate_playlist,
+    validate_item,
+    check_remote_url,
+    sniff_remote_url,
+    sniff_local_path,
+    detect_container,
+)
+
+MP4_HEADER = b"\x00\x00\x00\x20ftypisom" + b"\x00" * 20
+SNIFF_LIMIT = 64
+
+
+class MockStream:
+    """Simulates a streamed HTTP response returned by httpx.AsyncClient.stream."""
+
+    def __init__(self, chunks=(), status_code=206, headers=None):
+        self.chunks = list(chunks)
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.bytes_sent = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def aiter_bytes(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+
+class MockResponse:
+    """Simulates an HTTP HEAD response."""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
 
 
 @pytest.fixture
@@ -97,4 +136,157 @@ async def test_validate_playlist_with_mixed_entries(mocker):
     # Assert
     assert len(validated) == 2
     assert validated[0]["title"] == "Valid Local"
-    assert validated[1]["title"] == "Valid Remote"
\ No newline at end of file
+    assert validated[1]["title"] == "Valid Remote"
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (MP4_HEADER, "mp4"),
+        (b"\x1a\x45\xdf\xa3" + b"\x00" * 8, "matroska"),
+        (b"RIFF\x00\x00\x00\x00AVI LIST", "avi"),
+        (b"\x47" + b"\x00" * 187 + b"\x47", "mpegts"),
+        (b"#EXTM3U\n#EXT-X-VERSION:3", "hls"),
+        (b"\xff\xd8\xff\xe0", "jpeg"),
+        (b"GIF89a" + b"\x00" * 200, "gif"),
+        (b"<!DOCTYPE html><html>", None),
+        (b"", None),
+    ],
+)
+def test_detect_container(header, expected):
+    """Test container detection from file signatures."""
+    assert detect_container(header) == expected
+
+
+@pytest.mark.asyncio
+async def test_sniff_remote_url_ranged_response(mocker):
+    """Test that a ranged response is validated and the total size taken from Content-Range."""
+    stream = MockStream([MP4_HEADER], headers={"content-type": "video/mp4", "content-range": "bytes 0-63/123456"})
+    mock_stream = mocker.patch("httpx.AsyncClient.stream", return_value=stream)
+
+    result = await sniff_remote_url("http://example.com/video.mp4", max_bytes=SNIFF_LIMIT)
+
+    assert result.valid
+    assert result.container == "mp4"
+    assert result.content_length == 123456
+    assert mock_stream.call_args.kwargs["headers"]["Range"] == f"bytes=0-{SNIFF_LIMIT - 1}"
+
+
+@pytest.mark.asyncio
+async def test_sniff_remote_url_limits_bytes_read(mocker):
+    """Test that a server ignoring the Range header is only read up to the limit."""
+    chunks = [MP4_HEADER + b"\x00" * 1000] + [b"\x00" * 1024] * 100
+    stream = MockStream(chunks, status_code=200, headers={"content-type": "video/mp4", "content-length": "103400"})
+    mocker.patch("httpx.AsyncClient.stream", return_value=stream)
+
+    result = await sniff_remote_url("http://example.com/video.mp4", max_bytes=SNIFF_LIMIT)
+
+    assert result.valid
+    assert result.bytes_read == SNIFF_LIMIT
+    assert result.content_length == 103400
+    assert stream.bytes_sent == len(chunks[0])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "stream",
+    [
+        MockStream([b"<html>Not found</html>"], status_code=200, headers={"content-type": "text/html"}),
+        MockStream([b"\x00" * SNIFF_LIMIT], headers={"content-type": "application/octet-stream"}),
+        MockStream(status_code=404),
+    ],
+)
+async def test_sniff_remote_url_rejects_unplayable(mocker, stream):
+    """Test that error pages, unknown signatures and error statuses are rejected."""
+    mocker.patch("httpx.AsyncClient.stream", return_value=stream)
+
+    result = await sniff_remote_url("http://example.com/video.mp4", max_bytes=SNIFF_LIMIT)
+
+    assert not result.valid
+
+
+@pytest.mark.asyncio
+async def test_check_remote_url_falls_back_when_head_rejected(mocker):
+    """Test that a CDN rejecting HEAD is checked with a ranged GET instead."""
+    mocker.patch("httpx.AsyncClient.head", return_value=MockResponse(status_code=405))
+    mock_stream = mocker.patch("httpx.AsyncClient.stream", return_value=MockStream([MP4_HEADER]))
+
+    assert await check_remote_url("http://example.com/video.mp4")
+    mock_stream.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_check_remote_url_missing_file_skips_fallback(mocker):
+    """Test that a 404 on HEAD does not trigger the ranged GET."""
+    mocker.patch("httpx.AsyncClient.head", return_value=MockResponse(status_code=404))
+    mock_stream = mocker.patch("httpx.AsyncClient.stream")
+
+    assert not await check_remote_url("http://example.com/video.mp4")
+    mock_stream.assert_not_called()
+
+
+def test_sniff_local_path(tmp_path):
+    """Test that local files are checked through their first bytes and empty or missing files rejected."""
+    video = tmp_path / "video.mp4"
+    video.write_bytes(MP4_HEADER + b"\x00" * 10000)
+    empty = tmp_path / "empty.mp4"
+    empty.write_bytes(b"")
+
+    result = sniff_local_path(str(video), max_bytes=SNIFF_LIMIT)
+
+    assert result.valid
+    assert result.bytes_read == SNIFF_LIMIT
+    assert result.content_length == len(MP4_HEADER) + 10000
+    assert not sniff_local_path(str(empty)).valid
+    assert not sniff_local_path(str(tmp_path / "missing.mp4")).valid
+
+
+@pytest.mark.asyncio
+async def test_validate_item_sniff_mode_records_content_length(mocker, tmp_path):
+    """Test that sniff mode validates remote and local items and records their size without modifying them."""
+    stream = MockStream([MP4_HEADER], headers={"content-type": "video/mp4", "content-range": "bytes 0-4095/5000"})
+    mocker.patch("httpx.AsyncClient.stream", return_value=stream)
+    video = tmp_path / "video.mp4"
+    video.write_bytes(MP4_HEADER)
+    remote_item = {"title": "Remote", "url": "http://example.com/video.mp4"}
+    local_item = {"title": "Local", "url": f"file://{video}"}
+    content_lengths = {}
+
+    assert await validate_item(dict(remote_item), mode="sniff")
+    assert await validate_item(remote_item, mode="sniff", content_lengths=content_lengths)
+    assert await validate_item(local_item, mode="sniff", content_lengths=content_lengths)
+
+    assert content_lengths == {remote_item["url"]: 5000, local_item["url"]: len(MP4_HEADER)}
+    assert remote_item == {"title": "Remote", "url": "http://example.com/video.mp4"}
+    assert "content_length" not in local_item
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "content_type,header",
+    [
+        ("application/mp4", MP4_HEADER),
+        ("application/x-matroska", b"\x1a\x45\xdf\xa3" + b"\x00" * 8),
+        ("application/dash+xml", b'<?xml version="1.0"?>\n<MPD xmlns="urn:mpeg:dash:schema:mpd:2011">'),
+    ],
+)
+async def test_sniff_remote_url_accepts_application_types(mocker, content_type, header):
+    """Test that media served with application/* content types is decided by its signature."""
+    mocker.patch("httpx.AsyncClient.stream", return_value=MockStream([header], headers={"content-type": content_type}))
+
+    result = await sniff_remote_url("http://example.com/media", max_bytes=SNIFF_LIMIT * 2)
+
+    assert result.valid
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["head", "sniff"])
+async def test_validate_item_decodes_file_uri(tmp_path, mode):
+    """Test that percent-encoded file URIs, as produced by Path.as_uri(), resolve to the local file."""
+    video = tmp_path / "a b" / "video.mp4"
+    video.parent.mkdir()
+    video.write_bytes(MP4_HEADER)
+
+    assert "%20" in video.as_uri()
+    assert await validate_item({"title": "Local", "url": video.as_uri()}, mode=mode)
+    assert not await validate_item({"title": "Missing", "url": (tmp_path / "a b" / "missing.mp4").as_uri()}, mode=mode)
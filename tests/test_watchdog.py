@@ -0,0 +1,247 @@
+import pytest
+import vlc
+import time
+import asyncio
+from unittest.mock import Mock, AsyncMock
+from signengine.watchdog import PlaybackWatchdog
+from signengine.config import WATCHDOG_MAX_INCIDENTS
+
+PLAYLIST = [
+    {"title": "Video 1", "url": "http://example.com/video1.mp4"},
+    {"title": "Video 2", "url": "http://example.com/video2.mp4"},
+    {"title": "Video 3", "url": "http://example.com/video3.mp4"},
+]
+FALLBACK_PATH = "file:///opt/signengine/fallback.mp4"
+STALL_WINDOW = 5.0
+
+
+# Fixture: Fake PlaybackEngine whose state and time are set by the test
+@pytest.fixture
+def mock_engine():
+    engine = Mock()
+    engine.current_media_path = PLAYLIST[0]["url"]
+    engine.get_state = AsyncMock(return_value=vlc.State.Playing)
+    engine.get_time = AsyncMock(return_value=1000)
+
+    async def mock_play(media_path):
+        engine.current_media_path = media_path
+
+    engine.play = AsyncMock(side_effect=mock_play)
+    return engine
+
+
+@pytest.fixture
+def watchdog(mock_engine, clock):
+    watchdog = PlaybackWatchdog(mock_engine, stall_window=STALL_WINDOW, fallback_path=FALLBACK_PATH, clock=clock)
+    watchdog.set_playlist(PLAYLIST)
+    return watchdog
+
+
+@pytest.mark.asyncio
+async def test_watchdog_no_incident_while_progressing(mock_engine, clock, watchdog):
+    """Test that advancing playback time never triggers an incident."""
+    for step in range(10):
+        mock_engine.get_time.return_value = 1000 * (step + 1)
+        clock.now += 1.0
+        assert await watchdog.check() is None
+
+    assert list(watchdog.incidents) == []
+    mock_engine.play.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_detects_stall_and_skips(mocker, mock_engine, clock, watchdog):
+    """Test that a frozen position is detected after the stall window and the next item is played."""
+    mocker.patch("signengine.watchdog.validate_item", return_value=True)
+
+    await watchdog.check()
+    clock.now += STALL_WINDOW - 1
+    assert await watchdog.check() is None
+
+    clock.now += 1
+    incident = await watchdog.check()
+
+    assert incident.reason == "stall"
+    assert incident.media_path == PLAYLIST[0]["url"]
+    assert incident.stalled_for == STALL_WINDOW
+    assert incident.recovered_with == PLAYLIST[1]["url"]
+    assert incident.recovery_time == 0.0
+    assert list(watchdog.incidents) == [incident]
+    mock_engine.play.assert_awaited_once_with(PLAYLIST[1]["url"])
+
+
+@pytest.mark.asyncio
+async def test_watchdog_buffering_counts_towards_stall(mocker, mock_engine, clock, watchdog):
+    """Test that an item stuck buffering is treated as stalled."""
+    mocker.patch("signengine.watchdog.validate_item", return_value=True)
+    mock_engine.get_state.return_value = vlc.State.Buffering
+
+    await watchdog.check()
+    clock.now += STALL_WINDOW
+    incident = await watchdog.check()
+
+    assert incident.reason == "stall"
+    mock_engine.get_time.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_ignores_paused_playback(mock_engine, clock, watchdog):
+    """Test that a paused player is never reported as stalled."""
+    mock_engine.get_state.return_value = vlc.State.Paused
+
+    for _ in range(5):
+        clock.now += STALL_WINDOW
+        assert await watchdog.check() is None
+
+    assert list(watchdog.incidents) == []
+
+
+@pytest.mark.asyncio
+async def test_watchdog_error_skips_invalid_items(mocker, mock_engine, watchdog):
+    """Test that a VLC error skips to the next item that passes validation."""
+    mocker.patch("signengine.watchdog.validate_item", side_effect=[False, True])
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    incident = await watchdog.check()
+
+    assert incident.reason == "error"
+    assert incident.recovered_with == PLAYLIST[2]["url"]
+    mock_engine.discard_media.assert_called_once_with(PLAYLIST[0]["url"])
+    mock_engine.play.assert_awaited_once_with(PLAYLIST[2]["url"])
+
+
+@pytest.mark.asyncio
+async def test_watchdog_falls_back_to_cached_item(mocker, mock_engine, watchdog):
+    """Test that the fallback item is played when no playlist item is valid."""
+    validate = mocker.patch("signengine.watchdog.validate_item", return_value=False)
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    incident = await watchdog.check()
+
+    # The failing item itself is not retried
+    assert validate.call_count == len(PLAYLIST) - 1
+    assert incident.recovered_with == FALLBACK_PATH
+    mock_engine.play.assert_awaited_once_with(FALLBACK_PATH)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_records_unrecoverable_incident(mocker, mock_engine, watchdog):
+    """Test that an incident is still recorded when nothing can be played."""
+    mocker.patch("signengine.watchdog.validate_item", return_value=False)
+    watchdog.fallback_path = None
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    incident = await watchdog.check()
+
+    assert incident.recovered_with is None
+    assert incident.recovery_time is None
+    assert list(watchdog.incidents) == [incident]
+    mock_engine.play.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_ended_wraps_around_playlist(mocker, mock_engine, watchdog):
+    """Test that the last item ending advances back to the start without recording an incident."""
+    mocker.patch("signengine.watchdog.validate_item", return_value=True)
+    mock_engine.current_media_path = PLAYLIST[-1]["url"]
+    mock_engine.get_state.return_value = vlc.State.Ended
+
+    assert await watchdog.check() is None
+
+    assert len(watchdog.incidents) == 0
+    mock_engine.play.assert_awaited_once_with(PLAYLIST[0]["url"])
+
+
+@pytest.mark.asyncio
+async def test_watchdog_backs_off_after_unrecoverable_incident(mocker, mock_engine, clock, watchdog):
+    """Test that a dead item is not re-validated on every poll, with the wait doubling between attempts."""
+    validate = mocker.patch("signengine.watchdog.validate_item", return_value=False)
+    watchdog.fallback_path = None
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    assert await watchdog.check() is not None
+    for _ in range(4):
+        clock.now += 1.0
+        assert await watchdog.check() is None
+    assert validate.call_count == len(PLAYLIST) - 1
+
+    clock.now = STALL_WINDOW
+    assert await watchdog.check() is not None
+    clock.now += STALL_WINDOW
+    assert await watchdog.check() is None
+    assert len(watchdog.incidents) == 2
+
+
+@pytest.mark.asyncio
+async def test_watchdog_retries_when_state_changes(mocker, mock_engine, clock, watchdog):
+    """Test that the backoff is dropped once the failed item changes state."""
+    mocker.patch("signengine.watchdog.validate_item", return_value=False)
+    watchdog.fallback_path = None
+    mock_engine.get_state.return_value = vlc.State.Error
+    await watchdog.check()
+
+    mock_engine.get_state.return_value = vlc.State.Ended
+    clock.now += 1.0
+
+    assert (await watchdog.check()).reason == "ended"
+
+
+@pytest.mark.asyncio
+async def test_watchdog_incident_history_is_bounded(mocker, mock_engine, watchdog):
+    """Test that the incident history keeps only the most recent entries."""
+    mocker.patch("signengine.watchdog.validate_item", return_value=True)
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    for _ in range(WATCHDOG_MAX_INCIDENTS + 5):
+        await watchdog.check()
+
+    assert len(watchdog.incidents) == WATCHDOG_MAX_INCIDENTS
+
+
+@pytest.mark.asyncio
+async def test_watchdog_plays_cached_items_without_network(mocker, mock_engine, watchdog):
+    """Test that a prefetched item is used during an outage instead of the fallback."""
+    validate = mocker.patch("signengine.watchdog.validate_item", return_value=False)
+    watchdog.is_cached = lambda url: url == PLAYLIST[2]["url"]
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    incident = await watchdog.check()
+
+    assert incident.recovered_with == PLAYLIST[2]["url"]
+    validate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_falls_back_within_recovery_budget(mocker, mock_engine, watchdog):
+    """Test that an outage checks only a few items concurrently and reaches the fallback within the budget."""
+    async def unreachable(item, **kwargs):
+        await asyncio.sleep(5)
+        return False
+
+    validate = mocker.patch("signengine.watchdog.validate_item", side_effect=unreachable)
+    watchdog.set_playlist([{"title": f"Video {i}", "url": f"http://example.com/video{i}.mp4"} for i in range(100)])
+    watchdog.recovery_budget = 0.1
+    mock_engine.current_media_path = "http://example.com/video0.mp4"
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    started = time.monotonic()
+    incident = await watchdog.check()
+
+    assert time.monotonic() - started < 1.0
+    assert validate.call_count == watchdog.max_candidates
+    assert incident.recovered_with == FALLBACK_PATH
+
+
+@pytest.mark.asyncio
+async def test_watchdog_prefers_earliest_valid_candidate(mocker, mock_engine, watchdog):
+    """Test that a slow but valid earlier item wins over a faster later one."""
+    async def validate(item, **kwargs):
+        await asyncio.sleep(0.05 if item is PLAYLIST[1] else 0)
+        return True
+
+    mocker.patch("signengine.watchdog.validate_item", side_effect=validate)
+    mock_engine.get_state.return_value = vlc.State.Error
+
+    incident = await watchdog.check()
+
+    assert incident.recovered_with == PLAYLIST[1]["url"]